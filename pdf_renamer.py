@@ -1,11 +1,17 @@
 import os
+import re
 import sys
+import errno
+import shutil
+import hashlib
 import subprocess
-import importlib.util
+import importlib.metadata
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import threading
+import queue
 from pathlib import Path
+from collections import OrderedDict
 
 class DependencyManager:
     """Manages and installs required dependencies"""
@@ -13,39 +19,83 @@ class DependencyManager:
     REQUIRED_PACKAGES = {
         'pandas': 'pandas',
         'PyMuPDF': 'fitz',
-        'ttkthemes': 'ttkthemes'
+        'ttkthemes': 'ttkthemes',
+        'pyahocorasick': 'ahocorasick'
     }
     
-    @staticmethod
-    def check_package(package_name, import_name=None):
-        """Check if a package is installed"""
-        if import_name is None:
-            import_name = package_name
+    # Written once all packages are found and load, so later starts can
+    # skip the check
+    MARKER_FILE = Path.home() / '.pdf_renamer_deps'
+    
+    @classmethod
+    def marker_key(cls):
+        """Identify this interpreter and package list for the marker file"""
+        key = sys.executable + sys.version + repr(sorted(cls.REQUIRED_PACKAGES.items()))
+        return hashlib.sha1(key.encode()).hexdigest()
+    
+    @classmethod
+    def write_marker(cls):
+        """Record that the dependencies are installed and import correctly"""
+        marker_key = cls.marker_key()
+        try:
+            if cls.MARKER_FILE.read_text() == marker_key:
+                return
+        except OSError:
+            pass
         
         try:
-            importlib.import_module(import_name)
+            cls.MARKER_FILE.write_text(marker_key)
+        except OSError:
+            pass  # Not fatal, the check just runs again next time
+    
+    @staticmethod
+    def check_package(package_name):
+        """Check if a package is installed without importing it"""
+        try:
+            importlib.metadata.distribution(package_name)
             return True
-        except ImportError:
+        except importlib.metadata.PackageNotFoundError:
             return False
     
     @staticmethod
-    def install_package(package_name):
-        """Install a package using pip"""
+    def install_packages(package_names, output_callback=None):
+        """Install several packages with a single pip invocation"""
         try:
-            subprocess.check_call([
-                sys.executable, '-m', 'pip', 'install', package_name, '--user'
-            ])
-            return True
-        except subprocess.CalledProcessError:
+            with subprocess.Popen(
+                [sys.executable, '-m', 'pip', 'install', '--user', *package_names],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=1,
+                text=True
+            ) as process:
+                # Stream pip's output line by line so progress is visible while it runs
+                for line in process.stdout:
+                    if output_callback:
+                        output_callback(line)
+        except OSError:
             return False
+        
+        return process.returncode == 0
     
     @classmethod
     def ensure_dependencies(cls):
         """Ensure all required dependencies are installed"""
+        # A bundled executable ships its dependencies but usually not their
+        # package metadata, and cannot pip install into itself anyway
+        if getattr(sys, 'frozen', False):
+            return True
+        
+        marker_key = cls.marker_key()
+        try:
+            if cls.MARKER_FILE.read_text() == marker_key:
+                return True
+        except OSError:
+            pass
+        
         missing_packages = []
         
-        for package_name, import_name in cls.REQUIRED_PACKAGES.items():
-            if not cls.check_package(package_name, import_name):
+        for package_name in cls.REQUIRED_PACKAGES:
+            if not cls.check_package(package_name):
                 missing_packages.append(package_name)
         
         if missing_packages:
@@ -81,39 +131,65 @@ class DependencyManager:
                 progress_bar.pack(pady=10, padx=20, fill='x')
                 progress_bar.start()
                 
+                progress_text.insert(tk.END, f"Installing {', '.join(missing_packages)}...\n")
+                
+                # The worker thread only puts ('log', line) and ('done', success)
+                # messages on the queue, widgets are updated from the Tk main
+                # loop because Tk is not thread-safe
+                message_queue = queue.Queue()
+                
                 def install_packages():
-                    success_count = 0
-                    for package in missing_packages:
-                        progress_text.insert(tk.END, f"Installing {package}...\n")
-                        progress_text.see(tk.END)
-                        progress_window.update()
-                        
-                        if cls.install_package(package):
-                            progress_text.insert(tk.END, f"✓ {package} installed successfully\n")
-                            success_count += 1
-                        else:
-                            progress_text.insert(tk.END, f"✗ Failed to install {package}\n")
-                        
-                        progress_text.see(tk.END)
-                        progress_window.update()
-                    
+                    success = False
+                    try:
+                        success = cls.install_packages(
+                            missing_packages, lambda line: message_queue.put(('log', line))
+                        )
+                    finally:
+                        # Always report back so the dialog never waits forever
+                        message_queue.put(('done', success))
+                
+                def finish_installation(success):
                     progress_bar.stop()
                     
-                    if success_count == len(missing_packages):
+                    if success:
                         progress_text.insert(tk.END, "\n✓ All packages installed successfully!")
+                        progress_text.see(tk.END)
                         messagebox.showinfo("Success", "All dependencies installed successfully!\nPlease restart the application.")
                     else:
-                        progress_text.insert(tk.END, f"\n⚠ {len(missing_packages) - success_count} packages failed to install.")
-                        messagebox.showwarning("Partial Success", "Some packages failed to install.\nPlease install them manually or check your internet connection.")
+                        progress_text.insert(tk.END, "\n⚠ Package installation failed.")
+                        progress_text.see(tk.END)
+                        messagebox.showwarning("Installation Failed", "Some packages failed to install.\nPlease install them manually or check your internet connection.")
                     
                     progress_window.after(2000, progress_window.destroy)
                 
+                def drain_messages():
+                    lines = []
+                    done = None
+                    while not message_queue.empty():
+                        kind, value = message_queue.get_nowait()
+                        if kind == 'log':
+                            lines.append(value)
+                        else:
+                            done = value
+                    
+                    # One insert per poll rather than one per pip output line
+                    if lines:
+                        progress_text.insert(tk.END, "".join(lines))
+                        progress_text.see(tk.END)
+                    
+                    if done is None:
+                        progress_window.after(50, drain_messages)
+                    else:
+                        finish_installation(done)
+                
                 # Start installation in a separate thread
                 install_thread = threading.Thread(target=install_packages)
                 install_thread.daemon = True
                 install_thread.start()
                 
-                progress_window.mainloop()
+                progress_window.after(50, drain_messages)
+                progress_window.wait_window()
+                root.destroy()
                 return False  # Indicate restart needed
             else:
                 messagebox.showerror("Error", "Required dependencies are not installed.\nThe application cannot run without them.")
@@ -122,13 +198,89 @@ class DependencyManager:
         return True
 
 
+class NameMatcher:
+    """Finds which name from the name list occurs in a piece of text"""
+    
+    def __init__(self, names, case_sensitive=False):
+        self.case_sensitive = case_sensitive
+        self.automaton = None
+        self.pattern = None
+        self.names_by_needle = {}
+        
+        # Build an Aho-Corasick automaton so each text is scanned once no
+        # matter how many names there are, fall back to a single regex
+        try:
+            import ahocorasick
+            self.automaton = ahocorasick.Automaton()
+            for name in names:
+                needle = self.normalize(name)
+                if needle not in self.automaton:  # Keep the first of any duplicates
+                    self.automaton.add_word(needle, name)
+            self.automaton.make_automaton()
+        except ImportError:
+            for name in names:
+                self.names_by_needle.setdefault(self.normalize(name), name)
+            
+            # Longest names first so the alternation prefers them at a position,
+            # the lookahead reports overlapping matches like the automaton does
+            alternatives = sorted(names, key=len, reverse=True)
+            self.pattern = re.compile(
+                '(?=(' + '|'.join(map(re.escape, alternatives)) + '))',
+                0 if case_sensitive else re.IGNORECASE
+            )
+    
+    def normalize(self, text):
+        """Apply the case folding used for matching"""
+        return text if self.case_sensitive else text.lower()
+    
+    def find(self, text):
+        """Return the longest name found in text, or None"""
+        if self.automaton is not None:
+            matches = self.automaton.iter(self.normalize(text))
+            match = max(matches, key=lambda m: len(m[1]), default=None)
+            return match[1] if match else None
+        
+        matches = (m.group(1) for m in self.pattern.finditer(text))
+        match = max(matches, key=len, default=None)
+        if match is None:
+            return None
+        
+        # Map the matched text back to the name as written in the list
+        return self.names_by_needle.get(self.normalize(match), match)
+
+
 class PDFRenamer:
     """Main PDF Renaming Application"""
     
+    # PyMuPDF module, bound once by main() after the dependency check
+    _fitz = None
+    
+    # Pages searched when "first pages only" is enabled
+    FIRST_PAGES = 2
+    
+    # Page texts of fully read PDFs, keyed by (path, mtime, size)
+    PAGE_CACHE_SIZE = 512
+    _page_cache = OrderedDict()
+    _page_cache_lock = threading.Lock()
+    
     def __init__(self):
         self.pdf_files = []
         self.csv_file = ""
         self.output_dir = ""
+        
+        # Highest _N suffix used per output name during a run
+        self._name_counters = {}
+        
+        # Progress of the running rename, polled by the Tk main loop
+        self._renaming_active = False
+        self._processed_count = 0
+        self._processing = None  # (position, file name) being searched
+        
+        # Log messages waiting to be written to the output widget
+        self._log_buffer = []
+        self._pending_flush = False
+        self._log_lock = threading.Lock()
+        
         self.setup_ui()
     
     def setup_ui(self):
@@ -198,6 +350,14 @@ class PDFRenamer:
         )
         case_sensitive_checkbox.grid(row=1, column=0, sticky=tk.W)
         
+        self.first_pages_only_var = tk.BooleanVar()
+        first_pages_only_checkbox = ttk.Checkbutton(
+            options_frame, 
+            text=f"Search First {self.FIRST_PAGES} Pages Only (faster for long documents)", 
+            variable=self.first_pages_only_var
+        )
+        first_pages_only_checkbox.grid(row=2, column=0, sticky=tk.W)
+        
         # Control buttons
         button_frame = ttk.Frame(main_frame)
         button_frame.grid(row=2, column=0, columnspan=2, pady=(0, 10))
@@ -306,6 +466,9 @@ class PDFRenamer:
         self.csv_file_label.config(text="No file selected", foreground="gray")
         self.output_dir_label.config(text="No directory selected", foreground="gray")
         
+        # Drop buffered messages too, or they would reappear after the clear
+        with self._log_lock:
+            self._log_buffer.clear()
         self.text_output.delete(1.0, tk.END)
         self.progress_label.config(text="Ready to start...")
         self.progress_bar.config(value=0)
@@ -313,48 +476,236 @@ class PDFRenamer:
         self.log_message("All selections cleared")
     
     def log_message(self, message):
-        """Add message to output text widget"""
-        self.text_output.insert(tk.END, f"{message}\n")
+        """Add message to output text widget
+        
+        Messages are buffered and written about ten times a second, so long
+        runs do not redraw the widget for every line. Safe to call from
+        worker threads.
+        """
+        with self._log_lock:
+            self._log_buffer.append(f"{message}\n")
+            if self._pending_flush:
+                return
+            self._pending_flush = True
+        
+        self.root.after(100, self._flush_log)
+    
+    def _flush_log(self):
+        """Write buffered log messages to the output text widget"""
+        with self._log_lock:
+            text = "".join(self._log_buffer)
+            self._log_buffer.clear()
+            self._pending_flush = False
+        
+        self.text_output.insert(tk.END, text)
         self.text_output.see(tk.END)
-        self.root.update_idletasks()
     
-    def read_pdf_content(self, pdf_file):
-        """Read content from PDF file"""
-        try:
-            import fitz  # PyMuPDF
-            with fitz.open(pdf_file) as doc:
-                text = ""
-                for page in doc:
-                    text += page.get_text()
-                return text
-        except Exception as e:
-            self.log_message(f"Error reading PDF {pdf_file}: {str(e)}")
-            return ""
+    def update_progress(self, value, text):
+        """Update the progress bar and label, must run on the Tk main thread"""
+        self.progress_bar.config(value=value)
+        self.progress_label.config(text=text)
+    
+    def _progress_tick(self, total_files):
+        """Show the renaming thread's progress, rescheduling while it runs"""
+        if not self._renaming_active:
+            return
+        
+        # Set the value rather than step(), which wraps around at the maximum
+        self.progress_bar.config(value=self._processed_count)
+        
+        processing = self._processing
+        if processing:
+            position, file_name = processing
+            self.progress_label.config(text=f"Processing {position}/{total_files}: {file_name}")
+        
+        self.root.after(200, self._progress_tick, total_files)
+    
+    def iter_pdf_text(self, pdf_file, max_pages=None):
+        """Yield the text of a PDF file one page at a time
+        
+        max_pages limits reading to the first pages of the document.
+        Documents that are read to the end are cached. Those are the PDFs
+        with no matching name, which stay in place, so re-running with
+        different options does not parse them again.
+        """
+        stat = os.stat(pdf_file)
+        key = (pdf_file, stat.st_mtime_ns, stat.st_size)
+        
+        with self._page_cache_lock:
+            pages = self._page_cache.get(key)
+            if pages is not None:
+                self._page_cache.move_to_end(key)
+        
+        if pages is not None:
+            yield from pages[:max_pages]
+            return
+        
+        # Plain text without layout extras; expanding ligatures and folding
+        # whitespace also lets "ﬁ" or non-breaking spaces match the name list
+        fitz = self._fitz
+        flags = fitz.TEXTFLAGS_TEXT & ~fitz.TEXT_PRESERVE_LIGATURES & ~fitz.TEXT_PRESERVE_WHITESPACE
+        
+        pages = []
+        with fitz.open(pdf_file) as doc:
+            page_count = doc.page_count
+            if max_pages is not None:
+                page_count = min(page_count, max_pages)
+            
+            for index in range(page_count):
+                pages.append(doc.load_page(index).get_text("text", flags=flags))
+                yield pages[-1]
+            
+            complete = page_count == doc.page_count
+        
+        if not complete:
+            return
+        
+        with self._page_cache_lock:
+            self._page_cache[key] = tuple(pages)
+            if len(self._page_cache) > self.PAGE_CACHE_SIZE:
+                self._page_cache.popitem(last=False)
+    
+    def find_name_in_pdf(self, pdf_file, matcher, max_pages=None):
+        """Search a PDF page by page, stopping at the first page with a match
+        
+        Returns a (found_name, has_text) tuple.
+        """
+        has_text = False
+        for page_text in self.iter_pdf_text(pdf_file, max_pages):
+            if not page_text:
+                continue
+            
+            has_text = True
+            found_name = matcher.find(page_text)
+            if found_name:
+                return found_name, True
+        
+        return None, has_text
     
     def load_name_list(self):
         """Load names from CSV file"""
         try:
-            names = []
-            with open(self.csv_file, 'r', encoding='utf-8') as file:
-                for line in file:
-                    name = line.strip()
-                    if name:  # Skip empty lines
-                        names.append(name)
-            return names
+            lines = Path(self.csv_file).read_text(encoding='utf-8', errors='replace').splitlines()
+            names = (line.strip() for line in lines)
+            # Skip empty lines and drop duplicates, keeping the first occurrence
+            return list(dict.fromkeys(name for name in names if name))
         except Exception as e:
             self.log_message(f"Error reading CSV file: {str(e)}")
             return []
     
-    def generate_unique_filename(self, base_path, extension):
-        """Generate a unique filename if file already exists"""
-        counter = 1
-        new_path = base_path
+    def seed_name_counters(self, existing):
+        """Find the highest _N suffix already used for each PDF name in existing
+        
+        Only suffixes no larger than the number of files sharing the name
+        count, so numbers like dates or IDs in "Invoice_2023.pdf" are not
+        taken for duplicate counters.
+        """
+        suffixes = {}
+        file_counts = {}
+        extension = '.pdf'
+        
+        for name in existing:
+            stem, ext = os.path.splitext(name)
+            if ext != extension:
+                continue
+            
+            file_counts[stem] = file_counts.get(stem, 0) + 1
+            
+            base, sep, suffix = stem.rpartition('_')
+            if sep and suffix.isdecimal():
+                file_counts[base] = file_counts.get(base, 0) + 1
+                suffixes.setdefault(base, []).append(int(suffix))
+        
+        counters = {}
+        for base, numbers in suffixes.items():
+            plausible = [number for number in numbers if number <= file_counts[base]]
+            if plausible:
+                counters[base] = max(plausible)
+        
+        return counters
+    
+    def generate_unique_filename(self, base_name, extension, existing):
+        """Generate a filename that is not in existing and reserve it
+        
+        existing holds casefolded names of the output directory, so names
+        differing only by case clash even on case-insensitive filesystems
+        such as macOS APFS.
+        Clashing names get the next _N suffix from self._name_counters.
+        """
+        new_name = base_name + extension
+        
+        if new_name.casefold() in existing:
+            key = base_name.casefold()
+            counter = self._name_counters.get(key, 0)
+            
+            while new_name.casefold() in existing:
+                counter += 1
+                new_name = f"{base_name}_{counter}{extension}"
+            
+            self._name_counters[key] = counter
         
-        while os.path.exists(new_path + extension):
-            new_path = f"{base_path}_{counter}"
-            counter += 1
+        existing.add(new_name.casefold())
+        return new_name
+    
+    def move_file(self, source, destination):
+        """Move a file without ever replacing an existing destination
         
-        return new_path + extension
+        Raises FileExistsError if destination exists. Copies the file when
+        the destination is on another drive.
+        """
+        try:
+            # Linking fails if the destination exists, so check and move are atomic
+            os.link(source, destination)
+        except FileExistsError:
+            raise
+        except OSError as e:
+            # No hard link possible (other drive or filesystem), check first
+            if os.path.exists(destination):
+                raise FileExistsError(errno.EEXIST, "File exists", destination)
+            
+            if e.errno == errno.EXDEV:
+                shutil.move(source, destination)
+            else:
+                os.replace(source, destination)
+        else:
+            os.unlink(source)
+    
+    def move_files(self, move_queue, renamed_files, existing):
+        """Move files queued by rename_files until None arrives
+        
+        Items are ('move', (source, new_filename)) or ('log', message) and
+        are handled in queue order. Destination names are chosen here with
+        generate_unique_filename against existing.
+        """
+        while True:
+            item = move_queue.get()
+            if item is None:
+                return
+            
+            kind, value = item
+            if kind == 'log':
+                self.log_message(value)
+                continue
+            
+            pdf_file, new_filename = value
+            try:
+                while True:
+                    new_filepath = os.path.join(
+                        self.output_dir,
+                        self.generate_unique_filename(new_filename, '.pdf', existing)
+                    )
+                    try:
+                        self.move_file(pdf_file, new_filepath)
+                        break
+                    except FileExistsError:
+                        # Created after the directory was listed, the name
+                        # stays reserved so the next attempt gets a new one
+                        continue
+                
+                self.log_message(f"✓ Renamed: {Path(pdf_file).name} → {Path(new_filepath).name}")
+                renamed_files.append(new_filepath)
+            except Exception as e:
+                self.log_message(f"✗ Error processing {Path(pdf_file).name}: {str(e)}")
     
     def rename_files(self):
         """Perform the actual file renaming"""
@@ -365,6 +716,10 @@ class PDFRenamer:
         # Create output directory if it doesn't exist
         os.makedirs(self.output_dir, exist_ok=True)
         
+        # List the output directory once so duplicate checks need no syscalls
+        existing = {name.casefold() for name in os.listdir(self.output_dir)}
+        self._name_counters = self.seed_name_counters(existing)
+        
         # Load names from CSV
         name_list = self.load_name_list()
         if not name_list:
@@ -372,66 +727,82 @@ class PDFRenamer:
             return
         
         self.log_message(f"Loaded {len(name_list)} names from CSV file")
+        
+        # Prefer longer, more specific names so "Li" doesn't shadow "Li Wei"
+        name_list.sort(key=len, reverse=True)
+        
+        # Read the options once, each Tk variable read is a Tcl round trip
+        case_sensitive = self.case_sensitive_var.get()
+        fully_rename = self.fully_rename_var.get()
+        max_pages = self.FIRST_PAGES if self.first_pages_only_var.get() else None
+        
+        matcher = NameMatcher(name_list, case_sensitive)
         self.log_message("Starting renaming process...")
         
-        renamed_count = 0
         total_files = len(self.pdf_files)
         
         self.progress_bar.config(maximum=total_files)
         
+        # Progress is shown by a periodic tick rather than a redraw per file
+        self._processed_count = 0
+        self._processing = None
+        self._renaming_active = True
+        self.root.after(0, self._progress_tick, total_files)
+        
+        # Files are moved on their own thread, file I/O releases the GIL so a
+        # slow copy to another drive can proceed while the next PDF is read.
+        # Per-file messages go through the same queue to keep the log in
+        # selection order.
+        move_queue = queue.Queue(maxsize=16)
+        renamed_files = []
+        move_thread = threading.Thread(target=self.move_files, args=(move_queue, renamed_files, existing))
+        move_thread.daemon = True
+        move_thread.start()
+        
         for index, pdf_file in enumerate(self.pdf_files):
+            # Assigned as one tuple so the tick never sees a mixed update
+            self._processing = (index + 1, Path(pdf_file).name)
             try:
-                self.progress_label.config(text=f"Processing {index + 1}/{total_files}: {Path(pdf_file).name}")
-                self.progress_bar.config(value=index + 1)
-                self.root.update_idletasks()
-                
-                # Read PDF content
-                pdf_content = self.read_pdf_content(pdf_file)
-                if not pdf_content:
-                    self.log_message(f"⚠ Could not read content from {Path(pdf_file).name}")
+                # Name found in the PDF content, if any
+                found_name, has_text = self.find_name_in_pdf(pdf_file, matcher, max_pages)
+                if not found_name and max_pages is not None:
+                    # Later pages were never read, blank first pages included
+                    move_queue.put(('log', f"⚠ No name found in the first {max_pages} pages of {Path(pdf_file).name}"))
                     continue
                 
-                # Search for names in PDF content
-                found_name = None
-                for name in name_list:
-                    if self.case_sensitive_var.get():
-                        if name in pdf_content:
-                            found_name = name
-                            break
-                    else:
-                        if name.lower() in pdf_content.lower():
-                            found_name = name
-                            break
+                if not has_text:
+                    move_queue.put(('log', f"⚠ Could not read content from {Path(pdf_file).name}"))
+                    continue
                 
                 if found_name:
                     # Generate new filename
                     original_filename = Path(pdf_file).stem
                     
-                    if self.fully_rename_var.get():
+                    if fully_rename:
                         new_filename = found_name
                     else:
                         new_filename = f"{found_name}_{original_filename}"
                     
-                    # Create full path
-                    new_filepath = os.path.join(self.output_dir, new_filename + '.pdf')
-                    
-                    # Handle duplicate filenames
-                    if os.path.exists(new_filepath):
-                        new_filepath = self.generate_unique_filename(
-                            os.path.join(self.output_dir, new_filename), '.pdf'
-                        )
-                    
-                    # Rename file
-                    os.rename(pdf_file, new_filepath)
-                    self.log_message(f"✓ Renamed: {Path(pdf_file).name} → {Path(new_filepath).name}")
-                    renamed_count += 1
+                    # Rename file, the mover handles duplicate filenames
+                    move_queue.put(('move', (pdf_file, new_filename)))
                 else:
-                    self.log_message(f"⚠ No matching name found for: {Path(pdf_file).name}")
+                    move_queue.put(('log', f"⚠ No matching name found for: {Path(pdf_file).name}"))
                 
             except Exception as e:
-                self.log_message(f"✗ Error processing {Path(pdf_file).name}: {str(e)}")
-        
-        self.progress_label.config(text=f"Completed: {renamed_count}/{total_files} files renamed")
+                move_queue.put(('log', f"✗ Error processing {Path(pdf_file).name}: {str(e)}"))
+            finally:
+                self._processed_count = index + 1
+        
+        # Wait for the queued moves to finish
+        move_queue.put(None)
+        move_thread.join()
+        renamed_count = len(renamed_files)
+        
+        self._renaming_active = False
+        self.root.after(
+            0, self.update_progress, total_files,
+            f"Completed: {renamed_count}/{total_files} files renamed"
+        )
         self.log_message(f"\nRenaming process completed!")
         self.log_message(f"Successfully renamed {renamed_count} out of {total_files} files.")
         
@@ -476,6 +847,39 @@ def main():
     
     print("All dependencies are available. Starting application...")
     
+    # Import PyMuPDF once instead of on every PDF read
+    try:
+        import fitz
+    except ImportError:
+        # The marker file skipped the check but a package was removed since,
+        # drop the marker and run the full check to offer the install again
+        try:
+            DependencyManager.MARKER_FILE.unlink()
+        except OSError:
+            pass
+        
+        if not DependencyManager.ensure_dependencies():
+            print("Dependency installation failed or incomplete. Please restart the application.")
+            return
+        
+        try:
+            import fitz
+        except ImportError as e:
+            # Installed according to its metadata but broken, e.g. a bad wheel
+            root = tk.Tk()
+            root.withdraw()
+            messagebox.showerror(
+                "Error",
+                f"PyMuPDF is installed but could not be loaded:\n\n{e}\n\n"
+                f"Please reinstall it and restart the application."
+            )
+            root.destroy()
+            return
+    
+    # Only now is it certain that the dependencies work
+    DependencyManager.write_marker()
+    PDFRenamer._fitz = fitz
+    
     # Create and run the application
     app = PDFRenamer()
     app.run()